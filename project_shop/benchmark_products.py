@@ -0,0 +1,79 @@
+import sqlite3
+import time
+import tracemalloc
+
+from models import PRODUCT_COLUMNS, product_row_factory
+
+# Micro-benchmark: per-row dicts (old get_product_list path) vs Product rows.
+ROW_COUNT = 100_000
+ROUNDS = 5
+
+
+def create_catalog(row_count):
+    """Create an in-memory products table filled with sample rows."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute('''
+        CREATE TABLE products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            price REAL,
+            image_url TEXT,
+            is_available BOOLEAN DEFAULT 1,
+            category_id INTEGER
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO products (name, description, price, image_url, is_available) VALUES (?, ?, ?, ?, ?)",
+        ((f"Product {i}", f"Description {i}", 1000 + i, f"images/{i}.jpg", i % 2) for i in range(row_count))
+    )
+    conn.commit()
+    return conn
+
+
+def load_as_dicts(conn):
+    """Load products the way get_product_list() used to."""
+    conn.row_factory = None
+    products = []
+    for row in conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM products"):
+        products.append({
+            "id": row[0],
+            "name": row[1],
+            "description": row[2],
+            "price": row[3],
+            "image_url": row[4],
+            "is_available": row[5],
+            "category_id": row[6]
+        })
+    return products
+
+
+def load_as_products(conn):
+    """Load products through the Product row factory."""
+    conn.row_factory = product_row_factory
+    return conn.execute(f"SELECT {PRODUCT_COLUMNS} FROM products").fetchall()
+
+
+def measure(loader, conn):
+    """Return the best wall time and the peak traced memory for a loader."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        loader(conn)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    products = loader(conn)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del products
+    return best, peak
+
+
+if __name__ == "__main__":
+    conn = create_catalog(ROW_COUNT)
+    print(f"Loading {ROW_COUNT} products, best of {ROUNDS} rounds:")
+    for label, loader in (("dict", load_as_dicts), ("Product", load_as_products)):
+        seconds, peak = measure(loader, conn)
+        print(f"  {label:<8} {seconds * 1000:8.1f} ms   peak {peak / 1024 / 1024:7.1f} MiB")
+    conn.close()
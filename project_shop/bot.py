@@ -21,7 +21,8 @@ async def show_main_menu(event):
         [Button.inline("🛍 فروشگاه", data="store")],
         [Button.inline("📞 پشتیبان تلگرام", data="telegram_support")],
         [Button.inline("💬 پشتیبان واتساپ", data="whatsapp_support")],
-        [Button.inline("📦 لیست محصولات", data="product_list")]
+        [Button.inline("📦 لیست محصولات", data="product_list")],
+        [Button.inline("🗂 دسته‌بندی‌ها", data="categories")]
     ]
     if user_id in ADMINS:
         buttons.append([Button.inline("⚙️ مدیریت محصولات", data="manage_products")])
@@ -48,28 +49,55 @@ async def handle_callback(event):
 
     elif data == "product_list":
         await database.save_user_action(user_id, "clicked_product_list")
-        products = await get_product_list()
+        products = await get_product_list(is_available=True)
         if not products:
             await event.respond("هیچ محصولی یافت نشد.")
             return
-        buttons = [[Button.inline(f"{p['name']} - {p['price']} تومان", data=f"buy_{p['id']}")] for p in products]
+        buttons = [[Button.inline(f"{p.name} - {p.price} تومان", data=f"buy_{p.id}")] for p in products]
         await event.respond("📋 لیست محصولات:", buttons=buttons)
 
+    elif data == "categories":
+        await database.save_user_action(user_id, "clicked_categories")
+        categories = await database.get_all_categories()
+        if not categories:
+            await event.respond("هیچ دسته‌بندی یافت نشد.")
+            return
+        buttons = [[Button.inline(c.name, data=f"category_{c.id}_price")] for c in categories]
+        buttons.append([Button.inline("🔙 بازگشت", data="back_to_main")])
+        await event.respond("🗂 دسته‌بندی‌ها:", buttons=buttons)
+
+    elif data.startswith("category_"):
+        _, category_id, sort = data.split("_")
+        category = await database.get_category_by_id(int(category_id))
+        if category is None:
+            await event.respond("دسته‌بندی مورد نظر یافت نشد.")
+            return
+
+        await database.save_user_action(user_id, f"clicked_category_{category.id}")
+        products = await database.get_products_by_category(category.id, is_available=True, sort=sort)
+        buttons = [[Button.inline(f"{p.name} - {p.price} تومان", data=f"buy_{p.id}")] for p in products]
+        buttons.append([
+            Button.inline("💰 ارزان‌ترین", data=f"category_{category.id}_price"),
+            Button.inline("🆕 جدیدترین", data=f"category_{category.id}_new")
+        ])
+        buttons.append([Button.inline("🔙 بازگشت", data="categories")])
+        text = f"📋 {category.name}:" if products else f"هیچ محصولی در دسته‌بندی {category.name} یافت نشد."
+        await event.respond(text, buttons=buttons)
+
     elif data.startswith("buy_"):
         product_id = data.split("_")[1]
-        products = await get_product_list()
-        selected_product = next((p for p in products if int(p["id"]) == int(product_id)), None)
+        selected_product = await database.get_product_by_id(int(product_id))
 
-        if selected_product is None:
+        if selected_product is None or not selected_product.is_available:
             await event.respond("محصول مورد نظر یافت نشد.")
             return
 
-        await database.save_user_action(user_id, f"requested_buy_{selected_product['id']}")
+        await database.save_user_action(user_id, f"requested_buy_{selected_product.id}")
 
         caption = (
-            f"🛍 <b>{selected_product['name']}</b>\n\n"
-            f"📄 {selected_product['description']}\n"
-            f"💰 قیمت: {selected_product['price']} تومان"
+            f"🛍 <b>{selected_product.name}</b>\n\n"
+            f"📄 {selected_product.description}\n"
+            f"💰 قیمت: {selected_product.price} تومان"
         )
 
         buttons = [[Button.url("🗨  خرید و صحبت با پشتیبان  ", url="https://t.me/MEHDI_CAPITAN_FF")]]
@@ -77,7 +105,7 @@ async def handle_callback(event):
         try:
             await client.send_file(
                 user_id,
-                file=selected_product['image_url'],
+                file=selected_product.image_url,
                 caption=caption,
                 buttons=buttons,
                 parse_mode="html"
@@ -90,13 +118,14 @@ async def handle_callback(event):
         await event.respond("📦 مدیریت محصولات", buttons=[
             [Button.inline("➕ اضافه کردن محصول", data="add_product")],
             [Button.inline("🗑 حذف محصول", data="delete_product")],
+            [Button.inline("🗂 اضافه کردن دسته‌بندی", data="add_category")],
             [Button.inline("🔙 بازگشت", data="back_to_main")]
         ])
         
         # نمایش لیست محصولات موجود
         products = await get_product_list()
         if products:
-            product_list = "\n".join([f"شناسه: {p['id']} - {p['name']} - {p['price']} تومان" for p in products])
+            product_list = "\n".join([f"شناسه: {p.id} - {p.name} - {p.price} تومان" for p in products])
             await event.respond(f"📋 لیست محصولات موجود:\n{product_list}")
         else:
             await event.respond("هیچ محصولی یافت نشد.")
@@ -112,6 +141,10 @@ async def handle_callback(event):
         pending_product_input[user_id] = "waiting_for_image"
         await event.respond("🖼 لطفاً تصویر محصول را ارسال کنید.")
 
+    elif data == "add_category" and user_id in ADMINS:
+        pending_product_input[user_id] = "waiting_for_category_name"
+        await event.respond("🗂 لطفاً نام دسته‌بندی را وارد کنید.")
+
     elif data == "delete_product" and user_id in ADMINS:
         pending_product_input[user_id] = "waiting_for_product_id_to_delete"
         await event.respond("🔻 لطفاً شناسه محصولی که می‌خواهید حذف کنید را ارسال کنید:")
@@ -119,6 +152,34 @@ async def handle_callback(event):
     elif data == "back_to_main":
         await show_main_menu(event)
 
+async def publish_product(event, user_id):
+    data = pending_product_input.pop(user_id)
+    await database.add_product(
+        name=data["name"],
+        description=data["description"],
+        price=data["price"],
+        image_url=data["image"],
+        is_available=True,
+        category_id=data.get("category_id")
+    )
+
+    product_info = f"🛍 {data['name']}\n\n📄 {data['description']}\n💰 قیمت: {data['price']} تومان"
+    buttons = [[Button.url("🗨 صحبت با پشتیبان", url="https://t.me/MEHDI_CAPITAN_FF")]] 
+
+    await event.respond(product_info, file=data["image"], buttons=buttons)
+
+    all_users = await database.get_all_users()
+    for uid in all_users:
+        try:
+            await client.send_file(
+                uid,
+                file=data["image"],
+                caption=product_info,
+                buttons=buttons
+            )
+        except Exception as e:
+            print(f"خطا در ارسال به کاربر {uid}: {e}")
+
 @client.on(events.NewMessage)
 async def handle_product_input(event):
     user_id = event.sender_id
@@ -160,33 +221,42 @@ async def handle_product_input(event):
                 await event.respond("❌ لطفاً فقط عدد وارد کنید.")
                 return
 
-            price = int(event.raw_text)
-            data = pending_product_input[user_id]
-            await database.add_product(
-                name=data["name"],
-                description=data["description"],
-                price=price,
-                image_url=data["image"],
-                is_available=True
-            )
+            pending_product_input[user_id]["price"] = int(event.raw_text)
 
-            product_info = f"🛍 {data['name']}\n\n📄 {data['description']}\n💰 قیمت: {price} تومان"
-            buttons = [[Button.url("🗨 صحبت با پشتیبان", url="https://t.me/MEHDI_CAPITAN_FF")]] 
+            categories = await database.get_all_categories()
+            if not categories:
+                await publish_product(event, user_id)
+                return
 
-            await event.respond(product_info, file=data["image"], buttons=buttons)
+            pending_product_input[user_id]["status"] = "waiting_for_category"
+            category_list = "\n".join([f"شناسه: {c.id} - {c.name}" for c in categories])
+            await event.respond(f"🗂 لطفاً شناسه دسته‌بندی محصول را وارد کنید (برای بدون دسته‌بندی 0 بفرستید):\n{category_list}")
 
-            all_users = await database.get_all_users()
-            for uid in all_users:
-                try:
-                    await client.send_file(
-                        uid,
-                        file=data["image"],
-                        caption=product_info,
-                        buttons=buttons
-                    )
-                except Exception as e:
-                    print(f"خطا در ارسال به کاربر {uid}: {e}")
+        elif isinstance(status_info, dict) and status_info.get("status") == "waiting_for_category":
+            if not event.raw_text.isdigit():
+                await event.respond("❌ لطفاً فقط عدد وارد کنید.")
+                return
+
+            category_id = int(event.raw_text)
+            if category_id != 0:
+                category = await database.get_category_by_id(category_id)
+                if category is None:
+                    await event.respond("❌ دسته‌بندی با این شناسه یافت نشد.")
+                    return
+                pending_product_input[user_id]["category_id"] = category_id
+
+            await publish_product(event, user_id)
 
+        elif status_info == "waiting_for_category_name":
+            name = event.raw_text.strip()
+            if len(name) < 2:
+                await event.respond("❌ نام دسته‌بندی خیلی کوتاه است.")
+                return
+
+            if await database.add_category(name):
+                await event.respond(f"✅ دسته‌بندی {name} اضافه شد.")
+            else:
+                await event.respond("❌ افزودن دسته‌بندی با مشکل مواجه شد.")
             pending_product_input.pop(user_id)
 
         elif status_info == "waiting_for_product_id_to_delete":
@@ -1,9 +1,23 @@
 import aiosqlite
 import asyncio
+from models import (
+    PRODUCT_COLUMNS,
+    PRODUCT_SUMMARY_COLUMNS,
+    category_row_factory,
+    product_row_factory,
+    product_summary_row_factory,
+)
 
 # Database configuration
 DB_NAME = 'products_Information.db'
 
+# ORDER BY clauses for category listings. Recency uses the AUTOINCREMENT id,
+# which only ever grows, so no separate timestamp column is needed.
+PRODUCT_SORTS = {
+    "price": "price, id",
+    "new": "id DESC",
+}
+
 async def get_db_connection():
     """Create and return a database connection."""
     try:
@@ -27,7 +41,8 @@ async def create_product_table():
                     description TEXT,
                     price REAL,
                     image_url TEXT,
-                    is_available BOOLEAN DEFAULT 1
+                    is_available BOOLEAN DEFAULT 1,
+                    category_id INTEGER REFERENCES categories(id) ON DELETE SET NULL
                 )
             ''')
             await conn.commit()
@@ -74,6 +89,11 @@ async def update_product_table():
                 await conn.execute("ALTER TABLE products ADD COLUMN is_available BOOLEAN DEFAULT 1;")
                 changes_made = True
 
+            if 'category_id' not in column_names:
+                print("Column 'category_id' not found. Adding it now.")
+                await conn.execute("ALTER TABLE products ADD COLUMN category_id INTEGER REFERENCES categories(id) ON DELETE SET NULL;")
+                changes_made = True
+
             if changes_made:
                 await conn.commit()
                 print("Product table updated successfully.")
@@ -89,6 +109,56 @@ async def update_product_table():
     return None
 
 
+async def create_product_indexes():
+    """Create the composite indexes that serve category listings.
+
+    Each index covers every column a listing selects, so browsing a category
+    is answered from the index alone, whichever sort order is used.
+    """
+    conn = await get_db_connection()
+    if conn:
+        try:
+            await conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_products_category_price
+                ON products (category_id, is_available, price, id, name)
+            ''')
+            await conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_products_category_new
+                ON products (category_id, is_available, id, name, price)
+            ''')
+            await conn.commit()
+            print("Product indexes created or already exist.")
+            return True
+        except Exception as e:
+            print(f"Error creating product indexes: {e}")
+            return False
+        finally:
+            await conn.close()
+    return None
+
+
+async def create_categories_table():
+    """Create the categories table if it doesn't exist."""
+    conn = await get_db_connection()
+    if conn:
+        try:
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS categories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE
+                )
+            ''')
+            await conn.commit()
+            print("Categories table created or already exists.")
+            return True
+        except Exception as e:
+            print(f"Error creating categories table: {e}")
+            return False
+        finally:
+            await conn.close()
+    return None
+
+
 async def create_users_table():
     """Create the users table if it doesn't exist."""
     conn = await get_db_connection()
@@ -201,14 +271,14 @@ async def save_user_action(user_id, action):
     return False
 
 
-async def add_product(name, description, price, image_url, is_available=True):
+async def add_product(name, description, price, image_url, is_available=True, category_id=None):
     """Add a new product to the database."""
     conn = await get_db_connection()
     if conn:
         try:
             await conn.execute(
-                "INSERT INTO products (name, description, price, image_url, is_available) VALUES (?, ?, ?, ?, ?)",
-                (name, description, price, image_url, is_available)
+                "INSERT INTO products (name, description, price, image_url, is_available, category_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (name, description, price, image_url, is_available, category_id)
             )
             await conn.commit()
             print(f"Product '{name}' added successfully.")
@@ -220,7 +290,7 @@ async def add_product(name, description, price, image_url, is_available=True):
             await conn.close()
     return False
 
-async def edit_product(product_id, name=None, description=None, price=None, image_url=None, is_available=None):
+async def edit_product(product_id, name=None, description=None, price=None, image_url=None, is_available=None, category_id=None):
     """Edit an existing product in the database."""
     # First check if the product exists
     exists = await product_exists(product_id)
@@ -249,6 +319,9 @@ async def edit_product(product_id, name=None, description=None, price=None, imag
             if is_available is not None:
                 update_fields.append("is_available = ?")
                 values.append(is_available)
+            if category_id is not None:
+                update_fields.append("category_id = ?")
+                values.append(category_id)
 
             if not update_fields:
                 print("No fields to update.")
@@ -310,11 +383,12 @@ async def get_all_products(limit=None):
     conn = await get_db_connection()
     if conn:
         try:
+            conn.row_factory = product_row_factory
             cursor = await conn.cursor()
             if limit:
-                await cursor.execute("SELECT * FROM products LIMIT ?", (limit,))
+                await cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products LIMIT ?", (limit,))
             else:
-                await cursor.execute("SELECT * FROM products")
+                await cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products")
             products = await cursor.fetchall()
             print(f"Retrieved {len(products)} products from database.")
             return products
@@ -330,8 +404,9 @@ async def get_product_by_id(product_id):
     conn = await get_db_connection()
     if conn:
         try:
+            conn.row_factory = product_row_factory
             cursor = await conn.cursor()
-            await cursor.execute("SELECT * FROM products WHERE id = ?", (product_id,))
+            await cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id = ?", (product_id,))
             product = await cursor.fetchone()
             if product:
                 print(f"Retrieved product with ID {product_id}.")
@@ -350,8 +425,9 @@ async def get_products_by_availability(is_available=True):
     conn = await get_db_connection()
     if conn:
         try:
+            conn.row_factory = product_row_factory
             cursor = await conn.cursor()
-            await cursor.execute("SELECT * FROM products WHERE is_available = ?", (int(is_available),))
+            await cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products WHERE is_available = ?", (int(is_available),))
             products = await cursor.fetchall()
             status = "available" if is_available else "unavailable"
             print(f"Retrieved {len(products)} {status} products from database.")
@@ -368,9 +444,10 @@ async def search_products_by_name(name_query):
     conn = await get_db_connection()
     if conn:
         try:
+            conn.row_factory = product_row_factory
             cursor = await conn.cursor()
             like_query = f"%{name_query}%"
-            await cursor.execute("SELECT * FROM products WHERE name LIKE ?", (like_query,))
+            await cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products WHERE name LIKE ?", (like_query,))
             products = await cursor.fetchall()
             print(f"Found {len(products)} products matching '{name_query}'.")
             return products
@@ -381,6 +458,85 @@ async def search_products_by_name(name_query):
             await conn.close()
     return []
 
+async def add_category(name):
+    """Add a new category to the database."""
+    conn = await get_db_connection()
+    if conn:
+        try:
+            await conn.execute("INSERT INTO categories (name) VALUES (?)", (name,))
+            await conn.commit()
+            print(f"Category '{name}' added successfully.")
+            return True
+        except Exception as e:
+            print(f"Error adding category: {e}")
+            return False
+        finally:
+            await conn.close()
+    return False
+
+async def get_all_categories():
+    """Get all categories from the database, ordered by name."""
+    conn = await get_db_connection()
+    if conn:
+        try:
+            conn.row_factory = category_row_factory
+            cursor = await conn.cursor()
+            await cursor.execute("SELECT id, name FROM categories ORDER BY name")
+            return await cursor.fetchall()
+        except Exception as e:
+            print(f"Error fetching categories: {e}")
+            return []
+        finally:
+            await conn.close()
+    return []
+
+async def get_category_by_id(category_id):
+    """Get a category by its ID from the database."""
+    conn = await get_db_connection()
+    if conn:
+        try:
+            conn.row_factory = category_row_factory
+            cursor = await conn.cursor()
+            await cursor.execute("SELECT id, name FROM categories WHERE id = ?", (category_id,))
+            return await cursor.fetchone()
+        except Exception as e:
+            print(f"Error fetching category by ID: {e}")
+            return None
+        finally:
+            await conn.close()
+    return None
+
+async def get_products_by_category(category_id, is_available=True, sort="price"):
+    """Get a category's products filtered by availability, sorted by price or recency.
+
+    Only PRODUCT_SUMMARY_COLUMNS are selected so the query is served entirely
+    by idx_products_category_price or idx_products_category_new.
+    """
+    order_by = PRODUCT_SORTS.get(sort)
+    if order_by is None:
+        print(f"Unknown product sort '{sort}'.")
+        return []
+
+    conn = await get_db_connection()
+    if conn:
+        try:
+            conn.row_factory = product_summary_row_factory
+            cursor = await conn.cursor()
+            await cursor.execute(
+                f"SELECT {PRODUCT_SUMMARY_COLUMNS} FROM products "
+                f"WHERE category_id = ? AND is_available = ? ORDER BY {order_by}",
+                (category_id, int(is_available))
+            )
+            products = await cursor.fetchall()
+            print(f"Retrieved {len(products)} products in category {category_id}.")
+            return products
+        except Exception as e:
+            print(f"Error fetching products by category: {e}")
+            return []
+        finally:
+            await conn.close()
+    return []
+
 async def get_product_count():
     """Get the total number of products in the database."""
     conn = await get_db_connection()
@@ -405,12 +561,14 @@ async def get_product_count():
 async def initialize_db():
     """Initialize all database tables."""
     print("Initializing database...")
+    categories_table = await create_categories_table()
     product_table = await create_product_table()
     product_columns = await update_product_table()
+    product_indexes = await create_product_indexes()
     users_table = await create_users_table()
     actions_table = await create_user_actions_table()
 
-    if product_table and product_columns and users_table and actions_table:
+    if categories_table and product_table and product_columns and product_indexes and users_table and actions_table:
         print("✅ All database tables initialized successfully.")
         return True
     else:
@@ -0,0 +1,45 @@
+from collections import namedtuple
+
+# Column order used by every product read query; must match Product's fields.
+PRODUCT_COLUMNS = "id, name, description, price, image_url, is_available, category_id"
+
+# Columns used by category listings; kept small so the composite indexes on
+# products can answer these queries without touching the table.
+PRODUCT_SUMMARY_COLUMNS = "id, name, price"
+
+# A tuple subclass keeps rows compact (no per-row __dict__) and still allows
+# positional access for older code that indexes rows directly.
+Product = namedtuple("Product", ["id", "name", "description", "price", "image_url", "is_available", "category_id"])
+ProductSummary = namedtuple("ProductSummary", ["id", "name", "price"])
+Category = namedtuple("Category", ["id", "name"])
+
+
+def _price(value):
+    """Prices are stored as whole tomans, so they are returned as int."""
+    return int(value) if value is not None else None
+
+
+def product_row_factory(cursor, row):
+    """Build a Product from a row selected with PRODUCT_COLUMNS.
+
+    is_available is returned as a real bool.
+    """
+    return Product(
+        row[0],
+        row[1],
+        row[2],
+        _price(row[3]),
+        row[4],
+        bool(row[5]),
+        row[6],
+    )
+
+
+def product_summary_row_factory(cursor, row):
+    """Build a ProductSummary from a row selected with PRODUCT_SUMMARY_COLUMNS."""
+    return ProductSummary(row[0], row[1], _price(row[2]))
+
+
+def category_row_factory(cursor, row):
+    """Build a Category from an (id, name) row."""
+    return Category(row[0], row[1])
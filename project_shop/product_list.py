@@ -1,22 +1,18 @@
 from database import get_db_connection
+from models import PRODUCT_COLUMNS, product_row_factory
 
-async def get_product_list():
+async def get_product_list(is_available=None):
     products = []
     conn = await get_db_connection()
     if conn:
         try:
+            conn.row_factory = product_row_factory
             cursor = await conn.cursor()
-            await cursor.execute("SELECT * FROM products")
-            rows = await cursor.fetchall()
-            for row in rows:
-                products.append({
-                    "id": row[0],
-                    "name": row[1],
-                    "description": row[2],
-                    "price": row[3],
-                    "image_url": row[4],
-                    "is_available": row[5]
-                })
+            if is_available is None:
+                await cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products")
+            else:
+                await cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products WHERE is_available = ?", (int(is_available),))
+            products = await cursor.fetchall()
         except Exception as e:
             print(f"Error getting product list: {e}")
         finally: